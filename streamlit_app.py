@@ -13,8 +13,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import csv
 import json
 import io
+import sqlite3
+try:
+    import orjson  # much faster C JSON; optional
+except ImportError:
+    orjson = None
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from datetime import datetime
@@ -28,11 +34,13 @@ APP_SUBTITLE = "An interactive Streamlit app for geochemical analysis and normat
 DEVELOPER = "Developed by Taha Gamal"
 
 DATA_DIR = "data"
-SAVED_JSON = os.path.join(DATA_DIR, "saved_analyses.json")
+SAVED_JSON = os.path.join(DATA_DIR, "saved_analyses.json")  # legacy store, migrated on first run
+SAVED_DB = os.path.join(DATA_DIR, "saved_analyses.sqlite")
 CSV_TEMPLATE_NAME = "CIPW_input_template.csv"
 
 os.makedirs(DATA_DIR, exist_ok=True)
 OXIDES = ["SiO2", "Al2O3", "Fe2O3", "FeO", "MgO", "CaO", "Na2O", "K2O", "TiO2", "P2O5"]
+_OX_KEYS = [f"oxide_{ox}" for ox in OXIDES]
 
 # -----------------------
 # CIPW algorithm (simplified)
@@ -40,76 +48,222 @@ OXIDES = ["SiO2", "Al2O3", "Fe2O3", "FeO", "MgO", "CaO", "Na2O", "K2O", "TiO2",
 MW_FE2O3 = 159.69
 MW_FEO = 71.844
 
+MINERAL_NAMES = (
+    'Quartz (Q)', 'Orthoclase (Or)', 'Albite (Ab)', 'Anorthite (An)',
+    'Diopside (Di)', 'Olivine (Ol)', 'Magnetite (Mt)', 'Ilmenite (Il)', 'Apatite (Ap)'
+)
+
+MINERAL_DESCRIPTIONS = (
+    'Silicon dioxide — common in acidic and felsic rocks.',
+    'Potassium feldspar (KAlSi3O8) — common in silicic rocks.',
+    'Sodium feldspar (NaAlSi3O8) — typical in many silicic rocks.',
+    'Calcium feldspar (CaAl2Si2O8) — indicates higher Ca content.',
+    'Calcium–magnesium pyroxene — common in mafic to intermediate rocks.',
+    'Mg–Fe silicate — typical of mafic and ultramafic rocks.',
+    'Iron oxide — an indicator of oxidation state (Fe3+).',
+    'Titanium–iron oxide — indicator of Ti presence.',
+    'Calcium phosphate — phosphorus carrier.'
+)
+
+# Coefficient matrix mapping the 10 oxides (OXIDES order) onto the 9 normative
+# minerals (MINERAL_NAMES order); one row per mineral.  The Quartz row can go
+# negative and is clipped after the product.
+CIPW_MATRIX = np.array([
+    # SiO2 Al2O3 Fe2O3  FeO   MgO   CaO  Na2O   K2O  TiO2  P2O5
+    [1.0,  -2.0,  0.0,  0.0, -1.0, -1.0,  0.0,  0.0,  0.0,  0.0],   # Quartz
+    [0.0,   0.0,  0.0,  0.0,  0.0,  0.0,  0.0, 6.58,  0.0,  0.0],   # Orthoclase
+    [0.0,   0.0,  0.0,  0.0,  0.0,  0.0, 8.52,  0.0,  0.0,  0.0],   # Albite
+    [0.0,   0.0,  0.0,  0.0,  0.0, 2.35,  0.0,  0.0,  0.0,  0.0],   # Anorthite
+    [0.0,   0.0,  0.0,  0.0,  1.1,  1.1,  0.0,  0.0,  0.0,  0.0],   # Diopside
+    [0.0,   0.0,  0.0,  0.9,  0.9,  0.0,  0.0,  0.0,  0.0,  0.0],   # Olivine
+    [0.0,   0.0, 1.43,  0.0,  0.0,  0.0,  0.0,  0.0,  0.0,  0.0],   # Magnetite
+    [0.0,   0.0,  0.0,  0.0,  0.0,  0.0,  0.0,  0.0, 1.89,  0.0],   # Ilmenite
+    [0.0,   0.0,  0.0,  0.0,  0.0,  0.0,  0.0,  0.0,  0.0, 3.33],   # Apatite
+], dtype=np.float64)
+
+def calculate_cipw_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute normative wt% for every row of a DataFrame of oxide wt% columns.
+
+    Vectorized equivalent of calling calculate_cipw once per row: a single
+    (N,10) @ (10,9) matrix product plus one broadcasted normalization.
+    """
+    OX = df[OXIDES].to_numpy(dtype=np.float64, copy=True)
+    # FeO-from-Fe2O3 substitution, same rule as the scalar path.
+    OX[:, 3] = np.where(OX[:, 3] <= 0, OX[:, 2] * ((2 * MW_FEO) / MW_FE2O3), OX[:, 3])
+
+    raw = OX @ CIPW_MATRIX.T
+    raw = np.clip(raw, 0.0, None)
+    totals = raw.sum(axis=1, keepdims=True)
+    raw = np.divide(raw * 100.0, totals, out=np.zeros_like(raw), where=totals > 0)
+
+    return pd.DataFrame(np.round(raw, 4), columns=MINERAL_NAMES, index=df.index)
+
+def _cipw_core(ox):
+    """Straight-line numeric kernel: 10-element oxide vector -> normalized
+    9-element normative wt% vector (unrounded).  Kept free of dicts and
+    Python objects so numba can compile it when available."""
+    feo = ox[3]
+    if feo <= 0 and ox[2] > 0:  # estimate FeO from Fe2O3 when FeO was not reported
+        feo = ox[2] * ((2 * MW_FEO) / MW_FE2O3)
+
+    raw = np.empty(9, dtype=np.float64)
+    raw[0] = max(0.0, ox[0] - (ox[1] * 2.0 + ox[5] + ox[4]))  # Quartz
+    raw[1] = ox[7] * 6.58                                     # Orthoclase
+    raw[2] = ox[6] * 8.52                                     # Albite
+    raw[3] = ox[5] * 2.35                                     # Anorthite
+    raw[4] = (ox[5] + ox[4]) * 1.1                            # Diopside
+    raw[5] = (ox[4] + feo) * 0.9                              # Olivine
+    raw[6] = ox[2] * 1.43                                     # Magnetite
+    raw[7] = ox[8] * 1.89                                     # Ilmenite
+    raw[8] = ox[9] * 3.33                                     # Apatite
+
+    total_raw = raw.sum()
+    if total_raw > 0:
+        raw *= 100.0 / total_raw
+    else:
+        raw[:] = 0.0
+    return raw
+
+try:
+    from numba import njit
+    # Explicit signature forces compilation at import (or a cache load), so
+    # the first Calculate press pays no JIT cost.
+    _cipw_core = njit("float64[:](float64[:])", cache=True, fastmath=True)(_cipw_core)
+except ImportError:
+    pass
+
 def calculate_cipw(oxides: Dict[str, float]) -> Tuple[Dict[str, float], Dict[str, str]]:
-    SiO2 = float(oxides.get("SiO2", 0.0))
-    Al2O3 = float(oxides.get("Al2O3", 0.0))
-    Fe2O3 = float(oxides.get("Fe2O3", 0.0))
-    FeO = float(oxides.get("FeO", 0.0))
-    MgO = float(oxides.get("MgO", 0.0))
-    CaO = float(oxides.get("CaO", 0.0))
-    Na2O = float(oxides.get("Na2O", 0.0))
-    K2O = float(oxides.get("K2O", 0.0))
-    TiO2 = float(oxides.get("TiO2", 0.0))
-    P2O5 = float(oxides.get("P2O5", 0.0))
-
-    if FeO <= 0 and Fe2O3 > 0:
-        FeO = Fe2O3 * ((2 * MW_FEO) / MW_FE2O3)
-
-    raw = {
-        'Quartz (Q)': max(0.0, SiO2 - (Al2O3 * 2.0 + CaO + MgO)),
-        'Orthoclase (Or)': K2O * 6.58,
-        'Albite (Ab)': Na2O * 8.52,
-        'Anorthite (An)': CaO * 2.35,
-        'Diopside (Di)': (CaO + MgO) * 1.1,
-        'Olivine (Ol)': (MgO + FeO) * 0.9,
-        'Magnetite (Mt)': Fe2O3 * 1.43,
-        'Ilmenite (Il)': TiO2 * 1.89,
-        'Apatite (Ap)': P2O5 * 3.33
-    }
-
-    total_raw = sum(raw.values())
-    minerals = {k: round((v / total_raw) * 100.0, 4) if total_raw > 0 else 0.0 for k, v in raw.items()}
-
-    descriptions = {
-        'Quartz (Q)': 'Silicon dioxide — common in acidic and felsic rocks.',
-        'Orthoclase (Or)': 'Potassium feldspar (KAlSi3O8) — common in silicic rocks.',
-        'Albite (Ab)': 'Sodium feldspar (NaAlSi3O8) — typical in many silicic rocks.',
-        'Anorthite (An)': 'Calcium feldspar (CaAl2Si2O8) — indicates higher Ca content.',
-        'Diopside (Di)': 'Calcium–magnesium pyroxene — common in mafic to intermediate rocks.',
-        'Olivine (Ol)': 'Mg–Fe silicate — typical of mafic and ultramafic rocks.',
-        'Magnetite (Mt)': 'Iron oxide — an indicator of oxidation state (Fe3+).',
-        'Ilmenite (Il)': 'Titanium–iron oxide — indicator of Ti presence.',
-        'Apatite (Ap)': 'Calcium phosphate — phosphorus carrier.'
-    }
+    # Pack oxides into a fixed-order vector so the arithmetic stays in the kernel.
+    ox = np.fromiter((float(oxides.get(k, 0.0)) for k in OXIDES), dtype=np.float64, count=10)
+    raw = np.round(_cipw_core(ox), 4)
+
+    minerals = dict(zip(MINERAL_NAMES, raw.tolist()))
+    descriptions = dict(zip(MINERAL_NAMES, MINERAL_DESCRIPTIONS))
 
     return minerals, descriptions
 
 # -----------------------
 # Utility functions
 # -----------------------
-def load_saved_analyses():
-    if not os.path.exists(SAVED_JSON):
-        return {}
+def _json_dumps(obj) -> str:
+    return orjson.dumps(obj).decode("utf-8") if orjson is not None else json.dumps(obj, ensure_ascii=False)
+
+def _json_loads(s):
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+def _saved_db() -> sqlite3.Connection:
+    con = sqlite3.connect(SAVED_DB, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE IF NOT EXISTS saved (id TEXT PRIMARY KEY, ts TEXT, payload TEXT)")
+    # One-time migration of the legacy whole-file JSON store.  The file is
+    # renamed once imported so an emptied table never resurrects it.
+    if os.path.exists(SAVED_JSON) and con.execute("SELECT COUNT(*) FROM saved").fetchone()[0] == 0:
+        try:
+            with open(SAVED_JSON, "rb") as f:
+                legacy = _json_loads(f.read())
+            if isinstance(legacy, dict):
+                con.executemany(
+                    "INSERT OR REPLACE INTO saved (id, ts, payload) VALUES (?, ?, ?)",
+                    [(str(k), datetime.now().isoformat(), _json_dumps(v)) for k, v in legacy.items()],
+                )
+            os.replace(SAVED_JSON, SAVED_JSON + ".migrated")
+        except:
+            pass
+    return con
+
+@st.cache_data(show_spinner=False)
+def load_saved_analyses(mtime: float):
+    # mtime is only a cache key: the query reruns when the store changes.
+    con = _saved_db()
+    try:
+        rows = con.execute("SELECT id, payload FROM saved").fetchall()
+    finally:
+        con.close()
+    return {rid: _json_loads(payload) for rid, payload in rows}
+
+def saved_analyses_mtime() -> float:
+    # Under WAL, recent writes live in the -wal sidecar until a checkpoint,
+    # so key the cache on the newest of the two files.
+    t = 0.0
+    for p in (SAVED_DB, SAVED_DB + "-wal"):
+        if os.path.exists(p):
+            t = max(t, os.path.getmtime(p))
+    return t
+
+def write_saved_analysis(analysis_id: str, record: dict):
+    # Single INSERT OR REPLACE: O(1) per save instead of rewriting the
+    # whole store.
+    con = _saved_db()
     try:
-        with open(SAVED_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except:
-        return {}
+        con.execute(
+            "INSERT OR REPLACE INTO saved (id, ts, payload) VALUES (?, ?, ?)",
+            (analysis_id, datetime.now().isoformat(), _json_dumps(record)),
+        )
+    finally:
+        con.close()
+    load_saved_analyses.clear()
 
-def write_saved_analyses(d):
-    with open(SAVED_JSON, "w", encoding="utf-8") as f:
-        json.dump(d, f, ensure_ascii=False, indent=2)
+def delete_saved_analysis(analysis_id: str):
+    con = _saved_db()
+    try:
+        con.execute("DELETE FROM saved WHERE id = ?", (analysis_id,))
+    finally:
+        con.close()
+    load_saved_analyses.clear()
+
+try:
+    import xlsxwriter  # noqa: F401 -- only probed so we can pick the faster engine
+    _EXCEL_ENGINE = "xlsxwriter"
+except ImportError:
+    _EXCEL_ENGINE = "openpyxl"
 
+@st.cache_data(max_entries=16, show_spinner=False)
 def df_to_excel_bytes(df: pd.DataFrame, meta: dict) -> bytes:
+    # Cached so unrelated reruns (e.g. typing elsewhere) don't rebuild the
+    # workbook; Streamlit hashes df and meta for the cache key.
     out = io.BytesIO()
-    with pd.ExcelWriter(out, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="CIPW_Norm")
-        pd.DataFrame([meta]).to_excel(writer, index=False, sheet_name="Metadata")
+    if _EXCEL_ENGINE == "xlsxwriter":
+        with pd.ExcelWriter(out, engine="xlsxwriter", engine_kwargs={"options": {"in_memory": True}}) as writer:
+            df.to_excel(writer, index=False, sheet_name="CIPW_Norm")
+            # Write metadata directly; no need to build a one-row DataFrame.
+            ws = writer.book.add_worksheet("Metadata")
+            ws.write_row(0, 0, list(meta.keys()))
+            ws.write_row(1, 0, [str(v) for v in meta.values()])
+    else:
+        with pd.ExcelWriter(out, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, sheet_name="CIPW_Norm")
+            pd.DataFrame([meta]).to_excel(writer, index=False, sheet_name="Metadata")
     return out.getvalue()
 
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas as rl_canvas
+except ImportError:
+    rl_canvas = None
+
+@st.cache_data(max_entries=16, show_spinner=False)
 def df_to_pdf_bytes(df: pd.DataFrame, meta: dict) -> bytes:
     out = io.BytesIO()
+    if rl_canvas is not None:
+        # Plain text drawing with reportlab: no figure, no font/layout
+        # pipeline, far less work than the matplotlib page below.
+        c = rl_canvas.Canvas(out, pagesize=A4)
+        width, height = A4
+        c.setFont("Helvetica-Bold", 14)
+        c.drawCentredString(width / 2, height - 50, APP_TITLE)
+        c.setFont("Helvetica", 10)
+        c.drawCentredString(width / 2, height - 68, APP_SUBTITLE)
+        c.drawString(40, height - 100, f"Name: {meta.get('name', '')}")
+        c.drawString(40, height - 114, f"Date: {meta.get('date', '')}")
+        c.drawString(40, height - 128, f"Note: {meta.get('note', '')}")
+        c.setFont("Courier", 10)
+        y = height - 160
+        for _, row in df.iterrows():
+            c.drawString(40, y, f"{row['Mineral']}: {row['Normative wt%']}%")
+            y -= 12
+        c.showPage()
+        c.save()
+        return out.getvalue()
     with PdfPages(out) as pp:
         fig, ax = plt.subplots(figsize=(8.27, 11.69))
         ax.axis('off')
@@ -124,8 +278,24 @@ def df_to_pdf_bytes(df: pd.DataFrame, meta: dict) -> bytes:
         plt.close(fig)
     return out.getvalue()
 
-def csv_template_bytes() -> bytes:
-    return (",".join(OXIDES) + "\n").encode("utf-8")
+@st.cache_data(max_entries=16, show_spinner=False)
+def mineral_bar_png(values: tuple) -> bytes:
+    """Render the normative-minerals bar chart to PNG bytes, cached on the
+    values so unrelated reruns (e.g. note edits) skip matplotlib entirely."""
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(MINERAL_NAMES, values)
+    ax.set_ylabel("wt%")
+    # Fix tick positions before relabelling; set_xticklabels alone forces a
+    # locator recompute and a deprecation warning.
+    ax.set_xticks(range(len(MINERAL_NAMES)))
+    ax.set_xticklabels(MINERAL_NAMES, rotation=45, ha="right")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=144)
+    plt.close(fig)
+    return buf.getvalue()
+
+# Static template: built once at import instead of re-encoded every rerun.
+CSV_TEMPLATE_BYTES = (",".join(OXIDES) + "\n").encode("utf-8")
 
 # -----------------------
 # Streamlit UI
@@ -137,58 +307,100 @@ st.write("---")
 
 left_col, right_col = st.columns([1, 2.5])
 
-saved_analyses = load_saved_analyses()
+saved_analyses = load_saved_analyses(saved_analyses_mtime())
 for ox in OXIDES:
-    key = f"oxide_{ox}"
+    key = f"input_{ox}"
     if key not in st.session_state:
         st.session_state[key] = 0.0
 
-with left_col:
-    st.header("Inputs")
-    st.markdown("**Enter oxide wt%**")
+def reset_inputs():
+    # Runs as a button callback, i.e. before the widgets render, so the
+    # zeroed values show up in the same pass with no forced rerun.
     for ox in OXIDES:
-        st.session_state[f"oxide_{ox}"] = st.number_input(ox, min_value=0.0, value=float(st.session_state[f"oxide_{ox}"]), step=0.01, format="%.4f", key=f"input_{ox}")
-
-    if st.button("Reset all inputs"):
-        for ox in OXIDES:
-            st.session_state[f"oxide_{ox}"] = 0.0
-        st.success("All inputs reset to 0.0")
-        st.rerun()
+        st.session_state[f"input_{ox}"] = 0.0
+        st.session_state[f"oxide_{ox}"] = 0.0
 
-    st.markdown("---")
-    st.subheader("CSV Input (single-row)")
-    st.download_button("Download CSV template", data=csv_template_bytes(), file_name=CSV_TEMPLATE_NAME, mime="text/csv")
-    uploaded = st.file_uploader("Upload a single-row CSV file (one analysis)", type=["csv"])
+with left_col:
+    st.header("Inputs")
+    # CSV handling comes before the form so loaded values land in the
+    # widgets on this pass instead of needing a forced rerun.
+    st.subheader("CSV Input")
+    st.download_button("Download CSV template", data=CSV_TEMPLATE_BYTES, file_name=CSV_TEMPLATE_NAME, mime="text/csv")
+    uploaded = st.file_uploader("Upload a CSV file (one analysis per row)", type=["csv"])
     if uploaded is not None:
         try:
-            df_csv = pd.read_csv(uploaded)
-            if df_csv.shape[0] != 1:
-                st.error("CSV must contain exactly one row (one analysis).")
-            else:
-                missing = [c for c in OXIDES if c not in df_csv.columns]
-                if missing:
-                    st.error(f"Missing required columns: {missing}")
+            # csv.reader is enough here; pandas is only pulled in for the
+            # multi-row batch path below.
+            rdr = csv.reader(io.TextIOWrapper(uploaded, encoding="utf-8"))
+            header = [h.strip() for h in next(rdr, [])]
+            rows = [r for r in rdr if any(cell.strip() for cell in r)]
+            missing = [c for c in OXIDES if c not in header]
+            if missing:
+                st.error(f"Missing required columns: {missing}")
+            elif not rows:
+                st.error("CSV contains no data rows.")
+            elif len(rows) == 1:
+                idx = {h: i for i, h in enumerate(header)}
+                try:
+                    loaded = [float(rows[0][idx[ox]]) for ox in OXIDES]
+                except:
+                    st.error("CSV contains non-numeric value(s) in oxide columns.")
                 else:
-                    row = df_csv.iloc[0]
-                    try:
-                        for ox in OXIDES:
-                            st.session_state[f"oxide_{ox}"] = float(row[ox])
+                    # Load the values once per uploaded file: the uploader
+                    # keeps its file across reruns, and re-stomping the
+                    # widget keys every pass would make the form read-only.
+                    upload_id = (uploaded.name, uploaded.size)
+                    if st.session_state.get("csv_upload_id") != upload_id:
+                        st.session_state["csv_upload_id"] = upload_id
+                        for ox, val in zip(OXIDES, loaded):
+                            st.session_state[f"input_{ox}"] = val
                         st.success("Values loaded from CSV successfully")
-                        st.rerun()
-                    except:
-                        st.error("CSV contains non-numeric value(s) in oxide columns.")
+            else:
+                df_csv = pd.DataFrame(rows, columns=header)
+                try:
+                    batch_df = calculate_cipw_batch(df_csv)
+                except (TypeError, ValueError):
+                    st.error("CSV contains non-numeric value(s) in oxide columns.")
+                else:
+                    # Build the metadata once per uploaded file, not per
+                    # rerun: a fresh timestamp on every pass would defeat
+                    # the export cache and change the download filename.
+                    upload_id = (uploaded.name, uploaded.size)
+                    if st.session_state.get("batch_upload_id") != upload_id:
+                        st.session_state["batch_upload_id"] = upload_id
+                        st.session_state["batch_meta"] = {"name": f"Batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}", "date": datetime.now().isoformat(), "note": f"{len(batch_df)} analyses from uploaded CSV"}
+                    batch_meta = st.session_state["batch_meta"]
+                    st.success(f"Computed {len(batch_df)} analyses from CSV.")
+                    st.download_button("Download Batch Results (Excel)", data=df_to_excel_bytes(batch_df, batch_meta), file_name=f"{batch_meta['name']}_results.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
         except Exception as e:
             st.error(f"Failed to read CSV: {e}")
 
     st.markdown("---")
-    if st.button("Calculate CIPW Normative Minerals"):
-        oxide_values = {ox: float(st.session_state.get(f"oxide_{ox}", 0.0)) for ox in OXIDES}
-        minerals, descriptions = calculate_cipw(oxide_values)
-        results_df = pd.DataFrame([{"Mineral": k, "Normative wt%": v, "Description": descriptions.get(k, "")} for k, v in minerals.items()])
+    # A form batches all ten oxide edits into a single rerun on submit
+    # instead of rerunning the whole script per keystroke.
+    with st.form("oxide_inputs"):
+        st.markdown("**Enter oxide wt%**")
+        for ox in OXIDES:
+            st.session_state[f"oxide_{ox}"] = st.number_input(ox, min_value=0.0, step=0.01, format="%.4f", key=f"input_{ox}")
+        submitted = st.form_submit_button("Calculate CIPW Normative Minerals")
+
+    if submitted:
+        # Go straight from session state into the numeric kernel; the dict
+        # interface of calculate_cipw is kept for external callers only.
+        ox_arr = np.fromiter((st.session_state[k] for k in _OX_KEYS), dtype=np.float64, count=10)
+        # Column-dict constructor over the module-level tuples: no per-row
+        # dicts and no dtype inference.
+        results_df = pd.DataFrame({
+            "Mineral": MINERAL_NAMES,
+            "Normative wt%": np.round(_cipw_core(ox_arr), 4),
+            "Description": MINERAL_DESCRIPTIONS,
+        }, copy=False)
         st.session_state["last_results_df"] = results_df
         st.session_state["last_meta"] = {"name": f"Analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}", "date": datetime.now().isoformat(), "note": ""}
         st.success("Calculation done. See results on the right.")
-        st.rerun()
+
+    if st.button("Reset all inputs", on_click=reset_inputs):
+        st.success("All inputs reset to 0.0")
 
 # Right column: results
 with right_col:
@@ -199,11 +411,7 @@ with right_col:
         st.subheader("Normative minerals")
         st.dataframe(df[["Mineral", "Normative wt%", "Description"]], use_container_width=True)
 
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.bar(df["Mineral"], df["Normative wt%"])
-        ax.set_ylabel("wt%")
-        ax.set_xticklabels(df["Mineral"], rotation=45, ha="right")
-        st.pyplot(fig)
+        st.image(mineral_bar_png(tuple(df["Normative wt%"])), use_column_width=True)
 
         st.write("---")
         st.write("Note:")